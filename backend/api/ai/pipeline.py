@@ -1,27 +1,62 @@
 import asyncio
-import base64
 import json
 import random
-import requests
-from typing import Any, Callable, Dict, List
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 
+import httpx
+import orjson
 from google.cloud import speech_v1, texttospeech
 from loguru import logger
-from pymongo import database
 
 from ..ai.prompts import (
     get_prompt,
+    get_summary_prompt,
     processing_query_fillers,
 )
-from ..crud.chat_crud import add_many_messages
+from ..config import get_cfg
 from ..models.chat import ChatMessage
 from ..models.communication import LiveCommunication
-from ..utils.audio import transcribe_audio, text_to_speech
-from ..utils.types import MessageType, SendBotMessage
+from ..utils.audio import (
+    streaming_transcribe,
+    transcribe_audio,
+    text_to_speech,
+    truncate_for_tts,
+)
+from ..utils.types import MessageType, SendBotMessage, SendGenericMessage
 
+# shared across LLM calls so connections to the LLM service are kept alive
+_HTTPX = httpx.AsyncClient(
+    timeout=120,  # 120 seconds timeout
+    transport=httpx.AsyncHTTPTransport(
+        retries=3,  # retry failed connection attempts
+        limits=httpx.Limits(max_connections=128, max_keepalive_connections=64),
+    ),
+)
+# the transport only retries connecting, server errors are retried by _open_chat_stream
+LLM_RETRIES = 3
+LLM_BACKOFF_FACTOR = 0.5  # wait 0.5, 1, 2 seconds between retries
+LLM_RETRY_STATUSES = frozenset({500, 502, 503, 504})
 
-def is_question(text: str) -> bool:
-    question_words = [
+# blocking speech-to-text / text-to-speech calls run here, apart from the default executor
+_SPEECH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=get_cfg().speech_workers,
+    thread_name_prefix="speech",
+)
+
+_QUESTION_WORDS = frozenset(
+    {
         "who",
         "what",
         "where",
@@ -33,37 +68,54 @@ def is_question(text: str) -> bool:
         "can",
         "does",
         "do",
-    ]
+    }
+)
+# "hey, ..." in front of a question
+_GREETING_PREFIX = re.compile(r"^\s*hey[,\s]*", re.IGNORECASE)
+
+# asked for when no speech is recognized in the user audio
+LISTENING_PROMPT = "I'm listening. What would you like to know?"
+# synthesized LISTENING_PROMPT per (voice language code, voice gender)
+_LISTENING_PROMPT_AUDIO: Dict[Tuple[str, str], str] = {}
+
+# chat messages pushed out of the llm context before they are summarized
+SUMMARY_BATCH_MESSAGES = 10
+
+# whitespace following the end of a sentence
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.?!])\s+")
+
+# message content of an ollama /api/chat stream line, which is compact json
+_CHAT_CONTENT = re.compile(r'"content":"((?:[^"\\]|\\.)*)"')
+
+
+def is_question(text: str) -> bool:
+    lowered = text.lower()
     return (
-        text.strip().endswith("?")
-        or text.split()[0].lower() in question_words
-        or text.lower().replace("hey", "").replace(",", "").strip().split()[0]
-        in question_words
-    ) and len(text.split()) > 5
+        text.rstrip().endswith("?")
+        or _first_word(lowered) in _QUESTION_WORDS
+        or _first_word(_GREETING_PREFIX.sub("", lowered)) in _QUESTION_WORDS
+    ) and text.count(" ") >= 5
+
+
+def _first_word(text: str) -> str:
+    words = text.split(maxsplit=1)
+    return words[0] if words else ""
 
 
-def process_user_audio(
-    db: database.Database,
+async def process_user_audio(
     communication: LiveCommunication,
-    base64_audio: str,
+    audio_bytes: bytes,
     s2t_client: speech_v1.SpeechClient,
     t2s_client: texttospeech.TextToSpeechClient,
     llm_url: str,
-    send_message: Callable,
+    send_message: Callable[..., Awaitable],
 ):
     # return
-    audio_bytes = base64.b64decode(base64_audio)
-    transcript = transcribe_audio(audio_bytes, s2t_client)
+    transcript = await _run_blocking(transcribe_audio, audio_bytes, s2t_client)
     if transcript is None or transcript.strip() == "":
         # Return a prompt asking the user to say something
-        prompt = "I'm listening. What would you like to know?"
-        audio = text_to_speech(
-            prompt,
-            t2s_client,
-            communication.config.voice_language_code,
-            communication.config.voice_gender,
-        )
-        return {"audio": audio, "text": prompt, "user_query": "", "fixed_prompt": ""}
+        audio = await _listening_prompt_audio(communication, t2s_client)
+        return {"audio": audio, "text": LISTENING_PROMPT, "user_query": "", "fixed_prompt": ""}
 
     # Process all text with LLM (no more question filtering)
 
@@ -74,29 +126,25 @@ def process_user_audio(
     )
     try:
         message_payload = [
-            {
-                "role": m.role.value,
-                "content": m.message,
-            }
-            for m in communication.chat_history
-        ]
-        message_payload.append(
+            *communication.llm_history(),
             {
                 "role": user_message.role.value,
                 "content": get_prompt(user_message.message, communication.custom_prompt_suffix or ""),
-            }
+            },
+        ]
+        logger.debug(
+            "Sending to LLM: '{}' with suffix: '{}'",
+            user_message.message,
+            communication.custom_prompt_suffix,
         )
-        print(f"➡️ Sending to LLM: '{user_message.message}' with suffix: '{communication.custom_prompt_suffix}'")
         chat_url = f"{llm_url}/api/chat"
-        llm_response = process_request(
+        llm_response = "".join([content async for content in process_request(
             message_payload,
             chat_url,
             communication.config.llm_model,
             communication.custom_prompt_suffix or "",
-        )
-        print(f"User query: {user_message.message}")
-        print(f"Fixed prompt: {communication.custom_prompt_suffix}")
-        print(f"LLM response: {llm_response}")
+        )])
+        logger.debug("LLM response to '{}': {}", user_message.message, llm_response)
         bot_message = ChatMessage(
             communication_id=communication.config.id,
             role=MessageType.ASSISTANT,
@@ -104,11 +152,10 @@ def process_user_audio(
             llm_model=communication.config.llm_model,
         )
         new_messages = [user_message, bot_message]
-        communication.chat_history.extend(new_messages)
-        add_many_messages(db, new_messages)
-        tts_input = llm_response.encode("utf-8")[:4900].decode("utf-8", errors="ignore")
-        audio = text_to_speech(
-            tts_input,
+        _store_messages(communication, new_messages, llm_url)
+        audio = await _run_blocking(
+            text_to_speech,
+            truncate_for_tts(llm_response),
             t2s_client,
             communication.config.voice_language_code,
             communication.config.voice_gender,
@@ -124,13 +171,12 @@ def process_user_audio(
         return {"audio": "", "text": "", "user_query": "", "fixed_prompt": ""}
 
 
-def process_user_text(
-    db: database.Database,
+async def process_user_text(
     communication: LiveCommunication,
     text: str,
     t2s_client: texttospeech.TextToSpeechClient,
     llm_url: str,
-    send_message: Callable,
+    send_message: Callable[..., Awaitable],
 ):
     # Process all text with LLM (no more question filtering)
     user_message = ChatMessage(
@@ -140,31 +186,26 @@ def process_user_text(
     )
     try:
         message_payload = [
-            {
-                "role": m.role.value,
-                "content": m.message,
-            }
-            for m in communication.chat_history
-        ]
-        message_payload.append(
+            *communication.llm_history(),
             {
                 "role": user_message.role.value,
                 #"content": f"{communication.custom_prompt_suffix or ''}\n{user_message.message}",
                 "content": get_prompt(user_message.message, communication.custom_prompt_suffix or "")
-            }
+            },
+        ]
+        logger.debug(
+            "Sending to LLM: '{}' with suffix: '{}'",
+            user_message.message,
+            communication.custom_prompt_suffix,
         )
-        print("Applying suffix:", communication.custom_prompt_suffix),
         chat_url = f"{llm_url}/api/chat"
-        llm_response = process_request(
+        llm_response = "".join([content async for content in process_request(
             message_payload,
             chat_url,
             communication.config.llm_model.value,
             communication.custom_prompt_suffix or "",
-        )
-        # print("LLM response:", llm_response)
-        print(f"User query: {user_message.message}")
-        print(f"Fixed prompt: {communication.custom_prompt_suffix}")
-        print(f"LLM response: {llm_response}")
+        )])
+        logger.debug("LLM response to '{}': {}", user_message.message, llm_response)
         bot_message = ChatMessage(
             communication_id=communication.config.id,
             role=MessageType.ASSISTANT,
@@ -172,13 +213,10 @@ def process_user_text(
             llm_model=communication.config.llm_model,
         )
         new_messages = [user_message, bot_message]
-        communication.chat_history.extend(new_messages)
-        add_many_messages(db, new_messages)
-        if len(llm_response.encode("utf-8")) > 4900:
-            logger.warning("🔇 TTS input exceeded 4900 bytes, truncating for safety.")
-        tts_input = llm_response.encode("utf-8")[:4900].decode("utf-8", errors="ignore")
-        audio = text_to_speech(
-            tts_input,
+        _store_messages(communication, new_messages, llm_url)
+        audio = await _run_blocking(
+            text_to_speech,
+            truncate_for_tts(llm_response),
             t2s_client,
             communication.config.voice_language_code,
             communication.config.voice_gender,
@@ -194,129 +232,243 @@ def process_user_text(
         return {"audio": "", "text": "", "user_query": "", "fixed_prompt": ""}
 
 
-def process_request(
+def _store_messages(
+    communication: LiveCommunication,
+    messages: List[ChatMessage],
+    llm_url: str,
+):
+    communication.add_chat_messages(messages)
+    communication.pending_writes.extend(messages)
+
+    if (
+        len(communication.evicted_messages) >= SUMMARY_BATCH_MESSAGES
+        and (communication.summary_task is None or communication.summary_task.done())
+    ):
+        communication.summary_task = asyncio.create_task(
+            _summarize_evicted_messages(communication, llm_url)
+        )
+
+
+async def _summarize_evicted_messages(communication: LiveCommunication, llm_url: str):
+    """Folds the messages that left the llm context into the running summary"""
+    messages, communication.evicted_messages = communication.evicted_messages, []
+    generation = communication.history_generation
+    prompt = get_summary_prompt(communication.summary, messages)
+    try:
+        summary = "".join([content async for content in process_request(
+            [{"role": "user", "content": prompt}],
+            f"{llm_url}/api/chat",
+            communication.config.llm_model.value,
+            "",
+        )])
+    except Exception as e:
+        logger.exception(e)
+        if generation == communication.history_generation:
+            # retried with the next batch
+            communication.evicted_messages[:0] = messages
+        return
+
+    # the chat history was cleared in the meantime
+    if generation != communication.history_generation:
+        return
+    communication.summary = summary.strip() or communication.summary
+    logger.debug("Updated chat summary: {}", communication.summary)
+
+
+async def _listening_prompt_audio(
+    communication: LiveCommunication,
+    t2s_client: texttospeech.TextToSpeechClient,
+) -> str:
+    voice = (
+        communication.config.voice_language_code.value,
+        communication.config.voice_gender.value,
+    )
+    audio = _LISTENING_PROMPT_AUDIO.get(voice)
+    if audio is None:
+        audio = await _run_blocking(text_to_speech, LISTENING_PROMPT, t2s_client, *voice)
+        _LISTENING_PROMPT_AUDIO[voice] = audio
+    return audio
+
+
+async def process_request(
     message_history: List[Dict[str, Any]],
     chat_url: str,
     llm_model: str,
     custom_prompt_suffix: str,
-) -> str:
-    print("\n========== Prompt Sent to LLM ==========")
-    print("Model:", llm_model)
-    print("URL:", chat_url)
-    print("Full Payload:\n", json.dumps(message_history, indent=2))
-    print("Custom Prompt Suffix:", custom_prompt_suffix)
-    print("========================================\n")
+) -> AsyncIterator[str]:
+    """Yields the content of the LLM response as it is streamed"""
+    logger.debug(
+        "LLM call model={} url={} turns={}", llm_model, chat_url, len(message_history)
+    )
+    # only serialized when debug logging is enabled
+    logger.opt(lazy=True).debug(
+        "LLM payload:\n{}", lambda: json.dumps(message_history, indent=2)
+    )
 
     try:
-        # Configure retry strategy
-        retry_strategy = requests.adapters.Retry(
-            total=3,  # number of retries
-            backoff_factor=0.5,  # wait 0.5, 1, 2 seconds between retries
-            status_forcelist=[500, 502, 503, 504]  # retry on these status codes
-        )
-        
-        # Create a session with the retry strategy
-        session = requests.Session()
-        adapter = requests.adapters.HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-
-        # Make the request with timeout
-        response = session.post(
+        response = await _open_chat_stream(
             chat_url,
-            json={
-                "model": llm_model,
-                "messages": message_history,
-            },
-            stream=True,
-            timeout=120  # 120 seconds timeout
+            orjson.dumps({"model": llm_model, "messages": message_history}),
         )
+        try:
+            response.raise_for_status()  # Raise an error for bad status codes
 
-        response.raise_for_status()  # Raise an error for bad status codes
+            chunk: str
+            async for chunk in response.aiter_lines():
+                if chunk:
+                    content, done = _parse_chat_line(chunk)
 
-        llm_response = ""
-        chunk: bytes
-        for chunk in response.iter_lines():
-            if chunk:
-                chunk = chunk.decode("utf-8")
-                data: Dict[str, Any] = json.loads(chunk)
-
-                if data.get("message"):
-                    llm_response += data.get("message").get("content")
-                if data.get("done", False):
-                    break
+                    if content is not None:
+                        yield content
+                    if done:
+                        break
+        finally:
+            await response.aclose()
 
-        return llm_response
-
-    except requests.exceptions.ConnectionError as e:
+    except httpx.ConnectError as e:
         logger.error(f"Failed to connect to LLM service at {chat_url}. Error: {str(e)}")
         raise Exception(f"LLM service is not available. Please check if it's running at {chat_url}")
     
-    except requests.exceptions.Timeout as e:
+    except httpx.TimeoutException as e:
         logger.error(f"Request to LLM service timed out. URL: {chat_url}")
         raise Exception("LLM service request timed out. Please try again.")
     
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Error making request to LLM service: {str(e)}")
         raise Exception("Error communicating with LLM service. Please try again.")
 
 
-def process_user_audio_with_llm(
-    db: database.Database,
+async def _open_chat_stream(chat_url: str, content: bytes) -> httpx.Response:
+    """Sends the chat request, retrying server errors before any of the body is read"""
+    request = _HTTPX.build_request(
+        "POST",
+        chat_url,
+        content=content,
+        headers={"Content-Type": "application/json"},
+    )
+    for attempt in range(LLM_RETRIES):
+        response = await _HTTPX.send(request, stream=True)
+        if response.status_code not in LLM_RETRY_STATUSES:
+            return response
+        await response.aclose()
+        delay = LLM_BACKOFF_FACTOR * 2**attempt
+        logger.warning("LLM service returned {}, retrying in {}s", response.status_code, delay)
+        await asyncio.sleep(delay)
+    return await _HTTPX.send(request, stream=True)
+
+
+def _parse_chat_line(line: str) -> Tuple[Optional[str], bool]:
+    """Returns the message content and done flag of a chat stream line"""
+    match = _CHAT_CONTENT.search(line)
+    if match is None:
+        # unexpected shape (e.g. an error), parse the whole line
+        data: Dict[str, Any] = orjson.loads(line)
+        message = data.get("message")
+        return message.get("content") if message else None, data.get("done", False)
+
+    content = match.group(1)
+    if "\\" in content:
+        content = orjson.loads(f'"{content}"')
+    return content, '"done":true' in line
+
+
+async def close_llm_client():
+    await _HTTPX.aclose()
+
+
+def shutdown_speech_executor():
+    _SPEECH_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+
+
+async def _run_blocking(func: Callable, *args):
+    return await asyncio.get_running_loop().run_in_executor(_SPEECH_EXECUTOR, func, *args)
+
+
+async def process_user_audio_with_llm(
     communication: LiveCommunication,
-    base64_audio: str,
+    audio_bytes: bytes,
     s2t_client: speech_v1.SpeechClient,
     t2s_client: texttospeech.TextToSpeechClient,
     llm_url: str,
-    send_message: Callable,
+    send_message: Callable[..., Awaitable],
 ):
     """Process user audio directly with LLM - no filler logic"""
-    audio_bytes = base64.b64decode(base64_audio)
-    transcript = transcribe_audio(audio_bytes, s2t_client)
-    
+    transcript = await _run_blocking(transcribe_audio, audio_bytes, s2t_client)
+
+    return await _process_transcript_with_llm(
+        communication, transcript, t2s_client, llm_url, send_message
+    )
+
+
+async def process_user_audio_stream_with_llm(
+    communication: LiveCommunication,
+    audio_chunks: Iterable[bytes],
+    s2t_client: speech_v1.SpeechClient,
+    t2s_client: texttospeech.TextToSpeechClient,
+    llm_url: str,
+    send_message: Callable[..., Awaitable],
+    on_transcribed: Optional[Callable[[], None]] = None,
+):
+    """
+    Process user audio with LLM, transcribing it while it is being received.
+    `audio_chunks` is consumed from a worker thread, and `on_transcribed` is
+    called once the transcript is known, before the LLM is asked.
+    """
+    transcript = await _run_blocking(streaming_transcribe, audio_chunks, s2t_client)
+    if on_transcribed is not None:
+        on_transcribed()
+
+    return await _process_transcript_with_llm(
+        communication, transcript, t2s_client, llm_url, send_message
+    )
+
+
+async def _process_transcript_with_llm(
+    communication: LiveCommunication,
+    transcript: str,
+    t2s_client: texttospeech.TextToSpeechClient,
+    llm_url: str,
+    send_message: Callable[..., Awaitable],
+):
     if transcript is None or transcript.strip() == "":
         # Return a prompt asking the user to say something
-        prompt = "I'm listening. What would you like to know?"
-        audio = text_to_speech(
-            prompt,
-            t2s_client,
-            communication.config.voice_language_code,
-            communication.config.voice_gender,
-        )
-        return {"audio": audio, "text": prompt, "user_query": "", "fixed_prompt": ""}
+        audio = await _listening_prompt_audio(communication, t2s_client)
+        return {"audio": audio, "text": LISTENING_PROMPT, "user_query": "", "fixed_prompt": ""}
 
     # Process with LLM directly
-    return _process_with_llm(
-        db, communication, transcript, t2s_client, llm_url
+    return await _process_with_llm(
+        communication, transcript, t2s_client, llm_url, send_message
     )
 
 
-def process_user_text_with_llm(
-    db: database.Database,
+async def process_user_text_with_llm(
     communication: LiveCommunication,
     text: str,
     t2s_client: texttospeech.TextToSpeechClient,
     llm_url: str,
-    send_message: Callable,
+    send_message: Callable[..., Awaitable],
 ):
     """Process user text directly with LLM - no filler logic"""
     if not text or text.strip() == "":
         return None
         
     # Process with LLM directly
-    return _process_with_llm(
-        db, communication, text, t2s_client, llm_url
+    return await _process_with_llm(
+        communication, text, t2s_client, llm_url, send_message
     )
 
 
-def _process_with_llm(
-    db: database.Database,
+async def _process_with_llm(
     communication: LiveCommunication,
     user_input: str,
     t2s_client: texttospeech.TextToSpeechClient,
     llm_url: str,
+    send_message: Callable[..., Awaitable],
 ):
-    """Common LLM processing logic"""
+    """
+    Common LLM processing logic. The response is streamed to the bot through
+    `send_message` as text chunks, and as audio one sentence at a time.
+    """
     user_message = ChatMessage(
         communication_id=communication.config.id,
         role=MessageType.USER,
@@ -325,31 +477,49 @@ def _process_with_llm(
     
     try:
         message_payload = [
-            {
-                "role": m.role.value,
-                "content": m.message,
-            }
-            for m in communication.chat_history
-        ]
-        message_payload.append(
+            *communication.llm_history(),
             {
                 "role": user_message.role.value,
                 "content": get_prompt(user_input, communication.custom_prompt_suffix or ""),
-            }
-        )
+            },
+        ]
         
-        print(f"➡️ Sending to LLM: '{user_input}' with suffix: '{communication.custom_prompt_suffix}'")
+        logger.debug(
+            "Sending to LLM: '{}' with suffix: '{}'",
+            user_input,
+            communication.custom_prompt_suffix,
+        )
         chat_url = f"{llm_url}/api/chat"
-        llm_response = process_request(
-            message_payload,
-            chat_url,
-            communication.config.llm_model,
-            communication.custom_prompt_suffix or "",
+        llm_response = ""
+        pending_sentence = ""
+        # completed sentences are synthesized in order while the rest is generated
+        sentence_queue: asyncio.Queue = asyncio.Queue()
+        speaker = asyncio.create_task(
+            _speak_sentences(sentence_queue, communication, t2s_client, send_message)
         )
+        try:
+            async for content in process_request(
+                message_payload,
+                chat_url,
+                communication.config.llm_model,
+                communication.custom_prompt_suffix or "",
+            ):
+                if speaker.done():
+                    # a failed sentence ends the response instead of the rest of the stream
+                    speaker.result()
+                if not content:
+                    continue
+                llm_response += content
+                await send_message(SendBotMessage.TEXT_CHUNK, {"content": content})
+
+                *sentences, pending_sentence = _SENTENCE_BOUNDARY.split(pending_sentence + content)
+                for sentence in sentences:
+                    sentence_queue.put_nowait(sentence)
+        except BaseException:
+            speaker.cancel()
+            raise
         
-        print(f"User query: {user_input}")
-        print(f"Fixed prompt: {communication.custom_prompt_suffix}")
-        print(f"LLM response: {llm_response}")
+        logger.debug("LLM response to '{}': {}", user_input, llm_response)
         
         bot_message = ChatMessage(
             communication_id=communication.config.id,
@@ -359,22 +529,14 @@ def _process_with_llm(
         )
         
         new_messages = [user_message, bot_message]
-        communication.chat_history.extend(new_messages)
-        add_many_messages(db, new_messages)
-        
-        # Generate TTS for the response
-        if len(llm_response.encode("utf-8")) > 4900:
-            logger.warning("🔇 TTS input exceeded 4900 bytes, truncating for safety.")
-        tts_input = llm_response.encode("utf-8")[:4900].decode("utf-8", errors="ignore")
-        audio = text_to_speech(
-            tts_input,
-            t2s_client,
-            communication.config.voice_language_code,
-            communication.config.voice_gender,
-        )
+        _store_messages(communication, new_messages, llm_url)
+        sentence_queue.put_nowait(pending_sentence)
+        sentence_queue.put_nowait(None)
+        await speaker
         
+        # audio has already been streamed sentence by sentence
         return {
-            "audio": audio,
+            "audio": "",
             "text": llm_response,
             "user_query": user_input,
             "fixed_prompt": communication.custom_prompt_suffix or ""
@@ -382,4 +544,39 @@ def _process_with_llm(
         
     except Exception as e:
         logger.exception(e)
-        return None
\ No newline at end of file
+        # lets the bot drop the partial response that was already streamed
+        await send_message(
+            SendGenericMessage.ERROR,
+            {"message": "Failed to generate a response!"},
+        )
+        return None
+
+
+async def _speak_sentences(
+    sentence_queue: asyncio.Queue,
+    communication: LiveCommunication,
+    t2s_client: texttospeech.TextToSpeechClient,
+    send_message: Callable[..., Awaitable],
+):
+    """Sends the audio of the queued sentences one by one, until None is queued"""
+    while (sentence := await sentence_queue.get()) is not None:
+        await _send_sentence_audio(sentence, communication, t2s_client, send_message)
+
+
+async def _send_sentence_audio(
+    sentence: str,
+    communication: LiveCommunication,
+    t2s_client: texttospeech.TextToSpeechClient,
+    send_message: Callable[..., Awaitable],
+):
+    if sentence.strip() == "":
+        return
+
+    audio = await _run_blocking(
+        text_to_speech,
+        truncate_for_tts(sentence),
+        t2s_client,
+        communication.config.voice_language_code,
+        communication.config.voice_gender,
+    )
+    await send_message(SendBotMessage.AUDIO_CHUNK, {"response": audio})
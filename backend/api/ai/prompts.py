@@ -1,6 +1,18 @@
+from typing import Dict, List, Optional
+
+
 def get_prompt(user_input: str, initial_prompt_suffix: str) -> str:
     return f"{initial_prompt_suffix}\nUser: {user_input}\nAssistant:"
 
+def get_summary_prompt(summary: Optional[str], messages: List[Dict[str, str]]) -> str:
+    transcript = "\n".join(f"{m['role'].capitalize()}: {m['content']}" for m in messages)
+    previous = f"Summary so far: {summary}\n" if summary else ""
+    return (
+        "Summarize the following conversation between a user and an assistant "
+        "in a few sentences, keeping names, facts and preferences mentioned.\n"
+        f"{previous}{transcript}\nSummary:"
+    )
+
 processing_query_fillers = [
     "Hmm, let me see...",
     "Let me think about this for a bit.",
@@ -5,6 +5,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 
+from .ai.pipeline import close_llm_client, shutdown_speech_executor
 from .config import get_cfg
 from .mongodb import mongo_client
 from .routers import communication, socket, prompt
@@ -14,6 +15,9 @@ from .routers import communication, socket, prompt
 async def lifespan(app: FastAPI):
     yield
 
+    await close_llm_client()
+    shutdown_speech_executor()
+
     if mongo_client is not None:
         mongo_client.close()
         logger.info("Connection to MongoDB closed.")
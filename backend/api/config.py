@@ -19,6 +19,8 @@ class Config(BaseSettings):
         "http://localhost:11434"  # fallback for local development
     )
     ollama_port: int = int(os.getenv("OLLAMA_PORT", "11434"))
+    # worker threads for the blocking speech-to-text / text-to-speech calls
+    speech_workers: int = int(os.getenv("SPEECH_WORKERS", "16"))
 
     # Add environment-specific configurations
     is_docker: bool = os.getenv("DOCKER_ENV", "false").lower() == "true"
@@ -1,7 +1,7 @@
-from typing import List, Union
+from typing import Dict, List, Union
 
 from loguru import logger
-from pymongo import database, ASCENDING
+from pymongo import database, DESCENDING
 
 
 from ..models.chat import ChatMessage
@@ -24,19 +24,32 @@ def add_many_messages(db: database.Database, messages: List[ChatMessage]):
         logger.exception(e)
 
 
-def get_chat_history(
+def get_chat_payload(
     db: database.Database,
     communication_id: str,
-    sort_order: int = ASCENDING,
-) -> Union[List[ChatMessage], None]:
+    limit: int,
+) -> Union[List[Dict[str, str]], None]:
+    """
+    Latest `limit` messages of a communication, oldest first, in the
+    role/content shape sent to the llm.
+    """
     try:
         coll = db.get_collection(Collections.chat_messages)
-        chat_history = coll.find({"communicationId": communication_id}).sort(
-            "timestamp", sort_order
+        chat_history = (
+            coll.find(
+                {"communicationId": communication_id},
+                {"_id": 0, "role": 1, "message": 1},
+            )
+            .sort([("timestamp", DESCENDING), ("_id", DESCENDING)])
+            .limit(limit)
         )
 
-        chat_messages = [ChatMessage.from_dict(message) for message in chat_history]
-        return chat_messages
+        payload = [
+            {"role": message["role"], "content": message["message"]}
+            for message in chat_history
+        ]
+        payload.reverse()
+        return payload
 
     except Exception as e:
         logger.exception(e)
@@ -1,13 +1,15 @@
+import asyncio
 import datetime as dt
+from collections import deque
 from bson import ObjectId, Timestamp
-from typing import Any, Dict, List
+from typing import Any, Deque, Dict, List
 from typing import Optional
 import pydantic as pyd
 from fastapi import WebSocket
 
 from ..models.chat import ChatMessage
 from .activity import ActivityModel
-from ..utils import to_camel_case, to_snake_case
+from ..utils import to_camel_case
 from ..utils.types import LLMModel, SkinType, VoiceGender, VoiceLanguageCode
 
 
@@ -29,6 +31,7 @@ class CommunicationConfig(pyd.BaseModel):
 
     model_config = pyd.ConfigDict(
         extra="ignore",
+        validate_assignment=True,
         json_encoders={ObjectId: str},
     )
 
@@ -44,18 +47,12 @@ class CommunicationConfig(pyd.BaseModel):
             json_data["created_at"] = Timestamp(int(json_data["created_at"]), 1)
 
         # Convert keys to camelCase
-        data = {to_camel_case(k): v for k, v in json_data.items()}
+        data = {_SNAKE_TO_CAMEL.get(k, k): v for k, v in json_data.items()}
 
         # Handle _id for MongoDB
         if "id" in data:
             data["_id"] = ObjectId(data.pop("id"))
 
-        # ✅ Ensure customPromptSuffix is camelCased
-        data["customPromptSuffix"] = self.custom_prompt_suffix
-        
-        # ✅ Ensure subtitlesEnabled is camelCased
-        data["subtitlesEnabled"] = self.subtitles_enabled
-
         return data
 
     @classmethod
@@ -64,25 +61,25 @@ class CommunicationConfig(pyd.BaseModel):
             data["id"] = str(data.pop("_id"))
 
         # Convert camelCase to snake_case
-        json_data = {to_snake_case(k): v for k, v in data.items()}
+        json_data = {_CAMEL_TO_SNAKE.get(k, k): v for k, v in data.items()}
 
         # Convert Mongo Timestamps
         if isinstance(json_data.get("created_at"), Timestamp):
             json_data["created_at"] = json_data["created_at"].as_datetime()
 
-        # ✅ Fix: Always map camelCase version if snake_case is missing
-        if "custom_prompt_suffix" not in json_data:
-            if "customPromptSuffix" in data:
-                json_data["custom_prompt_suffix"] = data["customPromptSuffix"]
+        return cls(**json_data)
 
-        # ✅ Fix: Always map camelCase version if snake_case is missing
-        if "subtitles_enabled" not in json_data:
-            if "subtitlesEnabled" in data:
-                json_data["subtitles_enabled"] = data["subtitlesEnabled"]
 
-        return cls(**json_data)
+# field names are fixed, so the camelCase keys used in mongo are computed once
+_SNAKE_TO_CAMEL = {
+    name: to_camel_case(name) for name in CommunicationConfig.model_fields
+}
+_CAMEL_TO_SNAKE = {camel: snake for snake, camel in _SNAKE_TO_CAMEL.items()}
 
 
+# number of most recent turns (user message and reply) sent to the llm as context
+MAX_PAYLOAD_TURNS = 20
+MAX_PAYLOAD_MESSAGES = 2 * MAX_PAYLOAD_TURNS
 
 
 # dict of live communications (and chat history) with bot client and a controlpanel client
@@ -90,18 +87,66 @@ class LiveCommunication:
     def __init__(
         self,
         config: CommunicationConfig,
-        history: List[ChatMessage] = [],
+        history: Optional[List[Dict[str, str]]] = None,
     ):
         self.bot_client = None
         self.controlpanel_client = None
         self.config = config
-        self.processing_request = False
-        self.chat_history = history
+        self.processing_lock = asyncio.Lock()
+        self.message_payload = deque(history or (), maxlen=MAX_PAYLOAD_MESSAGES)
+        self.summary = None
+        self.evicted_messages = []
+        self.summary_task = None
+        self.history_generation = 0
+        self.pending_writes = []
+        self.flush_task = None
+        self.audio_queue = None
+        self.audio_task = None
+
+    def add_chat_messages(self, messages: List[ChatMessage]):
+        # keep the messages pushed out of the window, they get summarized
+        overflow = len(self.message_payload) + len(messages) - MAX_PAYLOAD_MESSAGES
+        for _ in range(min(max(overflow, 0), len(self.message_payload))):
+            self.evicted_messages.append(self.message_payload.popleft())
+        self.message_payload.extend(
+            {"role": m.role.value, "content": m.message} for m in messages
+        )
+
+    def llm_history(self) -> List[Dict[str, str]]:
+        if self.summary is None:
+            return list(self.message_payload)
+        return [
+            {"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"},
+            *self.message_payload,
+        ]
+
+    def clear_chat_history(self):
+        self.message_payload.clear()
+        self.summary = None
+        self.evicted_messages = []
+        self.history_generation += 1
+        if self.summary_task is not None:
+            self.summary_task.cancel()
+            self.summary_task = None
 
     bot_client: WebSocket
     controlpanel_client: WebSocket
     config: CommunicationConfig
-    processing_request: bool
-    chat_history: List[ChatMessage]
+    # held while a request of the controlpanel is processed by the llm
+    processing_lock: asyncio.Lock
+    # chat history in the shape expected by the llm, bounded to the latest messages
+    message_payload: Deque[Dict[str, str]]
+    # summary of the chat messages older than message_payload
+    summary: Optional[str]
+    evicted_messages: List[Dict[str, str]]
+    summary_task: Optional[asyncio.Task]
+    # bumped when the chat history is cleared, so running summaries are discarded
+    history_generation: int
+    # chat messages not yet saved to the database, flushed in batches by flush_task
+    pending_writes: List[ChatMessage]
+    flush_task: Optional[asyncio.Task]
+    # audio chunks of the utterance currently streamed by the controlpanel
+    audio_queue: Optional[asyncio.Queue]
+    audio_task: Optional[asyncio.Task]
     activity_data: List[ActivityModel]
     custom_prompt_suffix: Optional[str] = None
@@ -5,7 +5,7 @@ import pydantic as pyd
 from fastapi import APIRouter, HTTPException
 from pymongo import database
 
-from .socket import live_communications, LiveCommunication
+from .socket import live_communications, invalidate_idle_communication, LiveCommunication
 from ..crud.communication_crud import create_communication
 from ..mongodb import get_db, Collections
 from ..utils import Depends
@@ -62,9 +62,9 @@ async def get_controlpanel_config() -> GetConfigResponse:
     """
 
     return GetConfigResponse(
-        models=sorted([type.value for type in LLMModel]),
-        voices=sorted([type.value for type in VoiceLanguageCode]),
-        genders=sorted([type.value for type in VoiceGender]),
+        models=sorted(LLMModel.values()),
+        voices=sorted(VoiceLanguageCode.values()),
+        genders=sorted(VoiceGender.values()),
     )
 # backend/api/routers/communication.py or socket.py
 @router.post("/set-prompt-suffix")
@@ -86,6 +86,7 @@ async def set_prompt_suffix(
         {"publicId": comm_id},
         {"$set": {"customPromptSuffix": suffix}},
     )
+    invalidate_idle_communication(comm_id)
 
     print("Saving suffix:", suffix, "for communication:", comm_id)
     
@@ -104,6 +105,7 @@ async def set_subtitles_enabled(request: Request, db: database.Database = Depend
     )
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Communication ID not found")
+    invalidate_idle_communication(comm_id)
     # WebSocket push to bot if connected
     comm = live_communications.get(comm_id)
     if comm and comm.bot_client:
@@ -134,7 +136,8 @@ async def clear_history(request: Request, db: database.Database = Depends(get_db
         raise HTTPException(status_code=400, detail="Missing communication_id")
     # Clear in-memory chat history
     if comm_id in live_communications:
-        live_communications[comm_id].chat_history = []
+        live_communications[comm_id].clear_chat_history()
+    invalidate_idle_communication(comm_id)
     # Clear in database (if you store chat history in DB, add code here)
     # db.get_collection(Collections.chats).delete_many({"communication_id": comm_id})
     return {"message": "Chat history cleared"}
\ No newline at end of file
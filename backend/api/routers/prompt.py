@@ -3,6 +3,7 @@ from http import HTTPStatus
 from pymongo.database import Database
 from loguru import logger
 
+from .socket import invalidate_idle_communication
 from ..ai.prompts import get_prompt
 from ..mongodb import get_db, Collections
 from ..models.prompt import PromptModel
@@ -58,11 +59,12 @@ async def generate_prompt(
             )
 
         # Validate that the model is a valid LLMModel enum value
-        if llm_model not in [model.value for model in LLMModel]:
+        model = LLMModel.from_value(llm_model)
+        if model is None:
             logger.error(f"Invalid model value: {llm_model}")
             raise HTTPException(
                 status_code=HTTPStatus.BAD_REQUEST,
-                detail=f"Invalid model: {llm_model}. Valid models are: {[model.value for model in LLMModel]}"
+                detail=f"Invalid model: {llm_model}. Valid models are: {list(LLMModel.values())}"
             )
 
         # Generate the full prompt
@@ -75,7 +77,7 @@ async def generate_prompt(
             user_input=user_input,
             initial_prompt_suffix=custom_suffix,
             generated_prompt=full_prompt,
-            llm_model=llm_model,
+            llm_model=model,
         )
         
         saved_prompt = create_prompt(db, prompt)
@@ -124,6 +126,7 @@ async def set_prompt_suffix(
             status_code=HTTPStatus.NOT_FOUND,
             detail="Communication ID not found"
         )
+    invalidate_idle_communication(comm_id)
 
     print(f"✅ Saved suffix '{suffix}' for communication ID '{comm_id}'")
     return {"message": "Prompt suffix updated successfully"}
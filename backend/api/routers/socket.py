@@ -1,26 +1,39 @@
 import asyncio
-from typing import Any, Dict, Union
+import base64
+import concurrent.futures
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
 
+import orjson
 import pydantic as pyd
+from cachetools import TTLCache
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 from google.cloud import speech_v1, texttospeech
 from loguru import logger
 from pymongo import database
 
-from ..ai.pipeline import process_user_audio, process_user_text, process_user_audio_with_llm, process_user_text_with_llm
+from ..ai.pipeline import (
+    process_user_audio,
+    process_user_text,
+    process_user_audio_with_llm,
+    process_user_audio_stream_with_llm,
+    process_user_text_with_llm,
+)
 from ..config import get_cfg
-from ..crud.chat_crud import get_chat_history
+from ..crud.chat_crud import add_many_messages, get_chat_payload
 from ..crud.communication_crud import (
     get_communication_by_public_id,
     update_communication_by_public_id,
 )
-from ..models.communication import CommunicationConfig, LiveCommunication
-from ..mongodb import get_db, Collections
+from ..models.communication import (
+    CommunicationConfig,
+    LiveCommunication,
+    MAX_PAYLOAD_MESSAGES,
+)
+from ..mongodb import get_db
 from ..utils import Depends
 from ..utils.audio import get_s2t_client, get_t2s_client
 from ..utils.types import (
-    ReceiveBotMessage,
-    ReceiveControlPanelMessage,
+    RecvTag,
     SendBotMessage,
     SendControlPanelMessage,
     SendGenericMessage,
@@ -34,6 +47,14 @@ class WebSocketResponse(pyd.BaseModel):
 
 # ongoing communications
 live_communications: Dict[str, LiveCommunication] = {}
+# recently ended communications, so reconnecting clients skip the database
+idle_communications: TTLCache = TTLCache(maxsize=1024, ttl=30)
+# held while a communication is loaded, so concurrent connects load it once
+_loading_locks: Dict[str, asyncio.Lock] = {}
+# seconds between saves of the chat messages of a communication
+FLUSH_INTERVAL = 0.5
+# seconds to wait for the next chunk of streamed audio before ending the utterance
+AUDIO_CHUNK_TIMEOUT = 10
 
 @router.websocket("/ws/communication/{communication_id}")
 async def communicate(
@@ -47,28 +68,13 @@ async def communicate(
 ) -> WebSocketResponse:
     await websocket.accept()
 
-    if communication_id not in live_communications:
-        db_comm = get_communication_by_public_id(db, communication_id)
-        if db_comm is None:
-            return await _close_websocket(
-                websocket,
-                SendGenericMessage.INVALID_COMMUNICATION_ID,
-                "Invalid communication id",
-            )
-        print("Restored suffix from DB:", db_comm.custom_prompt_suffix)
-
-        history = get_chat_history(db, db_comm.id)
-
-        # fetch suffix manually if not present on db_comm
-        suffix = db.get_collection(Collections.communications).find_one({"publicId": communication_id})
-        prompt_suffix = suffix.get("customPromptSuffix", "") if suffix else ""
-
-        live_comm = LiveCommunication(config=db_comm, history=history)
-        live_comm.custom_prompt_suffix = db_comm.custom_prompt_suffix
-        live_communications[communication_id] = live_comm
-        print("Restoring suffix from DB:", db_comm.custom_prompt_suffix)
-
-    communication: LiveCommunication = live_communications.get(communication_id)
+    communication = await _get_live_communication(db, communication_id)
+    if communication is None:
+        return await _close_websocket(
+            websocket,
+            SendGenericMessage.INVALID_COMMUNICATION_ID,
+            "Invalid communication id",
+        )
 
     match client_identifier:
         case "controlpanel":
@@ -108,6 +114,11 @@ async def communicate(
             )
             return
 
+    if communication.flush_task is None:
+        communication.flush_task = asyncio.create_task(
+            _flush_periodically(db, communication)
+        )
+
     await _send_message(
         websocket,
         SendGenericMessage.SYSTEM_CONFIG,
@@ -116,7 +127,29 @@ async def communicate(
 
     try:
         while True:
-            data = await websocket.receive_json()
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            if message.get("bytes") is not None:
+                # binary frames carry raw audio chunks of the controlpanel.
+                # No frontend streams audio yet, this is for server-side clients.
+                if client_identifier == "controlpanel":
+                    await _queue_audio_chunk(
+                        db,
+                        communication,
+                        websocket,
+                        message["bytes"],
+                        s2t_client,
+                        t2s_client,
+                        cfg.llm_url,
+                    )
+                else:
+                    logger.warning("Dropped a binary frame from the bot.")
+                    await _send_invalid_message_type(websocket)
+                continue
+
+            data = orjson.loads(message["text"])
             if client_identifier == "bot":
                 await _handle_bot_messages(
                     db,
@@ -142,25 +175,111 @@ async def communicate(
             )
 
     except WebSocketDisconnect:
+        logger.debug("Client disconnected")
+
+    except Exception as e:
+        logger.exception(e)
+
+    finally:
+        # a replaced client must not detach the connection that replaced it
         if client_identifier == "bot":
-            communication.bot_client = None
-        elif client_identifier == "controlpanel":
+            if communication.bot_client is websocket:
+                communication.bot_client = None
+        elif communication.controlpanel_client is websocket:
             communication.controlpanel_client = None
+            _end_audio_stream(communication)
 
         if (
             communication.controlpanel_client is None
             and communication.bot_client is None
         ):
-            live_communications.pop(communication_id, None)
-            logger.info("Popping out live communication.")
-
-        logger.debug("Client disconnected")
+            if communication.flush_task is not None:
+                communication.flush_task.cancel()
+                communication.flush_task = None
+            await _flush_pending_writes(db, communication)
+            _park_communication(communication)
+        else:
+            await _flush_pending_writes(db, communication)
 
-    except Exception as e:
-        logger.exception(e)
     logger.info(f"Loaded communication {communication_id} with suffix: {communication.custom_prompt_suffix}")
 
 
+async def _get_live_communication(
+    db: database.Database, communication_id: str
+) -> Optional[LiveCommunication]:
+    communication = _take_loaded_communication(communication_id)
+    if communication is not None:
+        return communication
+
+    lock = _loading_locks.setdefault(communication_id, asyncio.Lock())
+    try:
+        async with lock:
+            # another connect may have loaded it while this one waited
+            communication = _take_loaded_communication(communication_id)
+            if communication is not None:
+                return communication
+
+            db_comm = await asyncio.to_thread(
+                get_communication_by_public_id, db, communication_id
+            )
+            if db_comm is None:
+                return None
+            logger.debug(f"Restored suffix from DB: {db_comm.custom_prompt_suffix}")
+
+            history = await asyncio.to_thread(
+                get_chat_payload, db, db_comm.id, MAX_PAYLOAD_MESSAGES
+            )
+            communication = LiveCommunication(config=db_comm, history=history)
+            communication.custom_prompt_suffix = db_comm.custom_prompt_suffix
+            live_communications[communication_id] = communication
+            return communication
+    finally:
+        if not lock.locked() and _loading_locks.get(communication_id) is lock:
+            del _loading_locks[communication_id]
+
+
+def _take_loaded_communication(communication_id: str) -> Optional[LiveCommunication]:
+    """Returns the live or idle communication, marking it live"""
+    communication = live_communications.get(communication_id)
+    if communication is None:
+        communication = idle_communications.pop(communication_id, None)
+        if communication is not None:
+            live_communications[communication_id] = communication
+    return communication
+
+
+async def _flush_pending_writes(db: database.Database, communication: LiveCommunication):
+    if communication.pending_writes:
+        messages, communication.pending_writes = communication.pending_writes, []
+        await asyncio.to_thread(add_many_messages, db, messages)
+
+
+async def _flush_periodically(db: database.Database, communication: LiveCommunication):
+    while True:
+        await asyncio.sleep(FLUSH_INTERVAL)
+        await _flush_pending_writes(db, communication)
+
+
+def _park_communication(communication: LiveCommunication):
+    """Move a communication without clients to the idle cache once its chat is saved"""
+    if (
+        communication.controlpanel_client is None
+        and communication.bot_client is None
+        and not communication.processing_lock.locked()
+        and not communication.pending_writes
+    ):
+        communication_id = communication.config.public_id
+        live_communications.pop(communication_id, None)
+        # keep it around for a while in case a client reconnects
+        idle_communications[communication_id] = communication
+        logger.info("Popping out live communication.")
+
+
+def invalidate_idle_communication(communication_id: str):
+    """Drop a cached communication whose database state has been changed"""
+    idle_communications.pop(communication_id, None)
+
+
 async def _handle_bot_messages(
     db: database.Database,
     communication: LiveCommunication,
@@ -172,20 +291,16 @@ async def _handle_bot_messages(
     llm_url: str,
 ):
     try:
-        message_type = ReceiveBotMessage[blob["type"]]
+        message_type = blob["type"]
         data = blob.get("data", {})
     except Exception:
-        return await _send_message(
-            bot_client,
-            SendGenericMessage.ERROR,
-            {"message": "Invalid Message Type"},
-        )
+        return await _send_invalid_message_type(bot_client)
 
     send_to_bot, send_to_bot_type = None, None
     send_to_cp, send_to_cp_type = None, None
 
     match message_type:
-        case ReceiveBotMessage.SEND_AUDIO:
+        case RecvTag.SEND_AUDIO:
             # Forward raw audio from bot to controlpanel for inspection/decision
             if controlpanel:
                 send_to_cp_type = SendControlPanelMessage.USER_INPUT
@@ -195,7 +310,7 @@ async def _handle_bot_messages(
                 send_to_bot_type = SendGenericMessage.ERROR
                 send_to_bot = {"message": "No control panel connected to handle AI input."}
 
-        case ReceiveBotMessage.SEND_TEXT:
+        case RecvTag.SEND_TEXT:
             # Forward raw text from bot to controlpanel for handling by controlpanel
             if controlpanel:
                 send_to_cp_type = SendControlPanelMessage.USER_INPUT
@@ -204,6 +319,9 @@ async def _handle_bot_messages(
                 send_to_bot_type = SendGenericMessage.ERROR
                 send_to_bot = {"message": "No control panel connected to handle AI input."}
 
+        case _:
+            return await _send_invalid_message_type(bot_client)
+
     if send_to_bot and send_to_bot_type:
         await _send_message(bot_client, send_to_bot_type, send_to_bot)
     if controlpanel and send_to_cp and send_to_cp_type:
@@ -222,26 +340,24 @@ async def _handle_controlpanel_messages(
     llm_url: str,
 ):
     try:
-        message_type = ReceiveControlPanelMessage[blob["type"]]
+        message_type = blob["type"]
         data = blob.get("data", {})
     except Exception:
-        return await _send_message(
-            controlpanel,
-            SendGenericMessage.ERROR,
-            {"message": "Invalid Message Type"},
-        )
+        return await _send_invalid_message_type(controlpanel)
 
     send_to_bot, send_to_bot_type = None, None
     send_to_cp, send_to_cp_type = None, None
 
+    stream_to_bot = _bot_streamer(communication)
+
     match message_type:
-        case ReceiveControlPanelMessage.UPDATE_CONFIG:
-            current_config = communication.config.model_dump()
-            filtered_config = {
-                key: data["config"].get(key, current_config[key])
-                for key in current_config
-            }
-            communication.config = CommunicationConfig.model_validate(filtered_config)
+        case RecvTag.UPDATE_CONFIG:
+            # only the updated fields are validated, on assignment
+            config = communication.config.model_copy()
+            for key, value in data["config"].items():
+                if key in CommunicationConfig.model_fields:
+                    setattr(config, key, value)
+            communication.config = config
             update_communication_by_public_id(db, communication.config)
             send_msg = {"config": communication.config.model_dump()}
             send_to_bot_type = SendGenericMessage.SYSTEM_CONFIG
@@ -249,66 +365,67 @@ async def _handle_controlpanel_messages(
             send_to_cp_type = SendGenericMessage.SYSTEM_CONFIG
             send_to_cp = send_msg
 
-        case ReceiveControlPanelMessage.PING:
+        case RecvTag.PING:
             send_to_cp_type = SendControlPanelMessage.PING_STATE
             send_to_cp = {"is_bot_connected": communication.bot_client is not None}
 
-        case ReceiveControlPanelMessage.SEND_AUDIO:
+        case RecvTag.SEND_AUDIO:
             # Control panel requested LLM processing for provided audio
-            if not communication.processing_request:
-                communication.processing_request = True
-                result = await asyncio.get_running_loop().run_in_executor(
-                    None,
-                    process_user_audio_with_llm,
-                    db,
-                    communication,
-                    data.get("audio"),
-                    s2t_client,
-                    t2s_client,
-                    llm_url,
-                    _send_message,
-                )
-                communication.processing_request = False
+            if communication.processing_lock.locked():
+                send_to_cp_type = SendGenericMessage.ERROR
+                send_to_cp = {"message": "Request already in progress!"}
+            else:
+                async with communication.processing_lock:
+                    result = await process_user_audio_with_llm(
+                        communication,
+                        base64.b64decode(data.get("audio")),
+                        s2t_client,
+                        t2s_client,
+                        llm_url,
+                        stream_to_bot,
+                    )
 
                 if result and bot_client:
                     send_to_bot_type = SendBotMessage.AUDIO_RESPONSE
-                    send_to_bot = {
-                        "response": result.get("audio"),
-                        "content": result.get("text"),
-                        "user_query": result.get("user_query"),
-                        "fixed_prompt": result.get("fixed_prompt"),
-                    }
-            else:
-                send_to_cp_type = SendGenericMessage.ERROR
-                send_to_cp = {"message": "Request already in progress!"}
+                    send_to_bot = _audio_response(result)
 
-        case ReceiveControlPanelMessage.SEND_TEXT:
+        case RecvTag.SEND_TEXT:
             # Control panel requested LLM processing for provided text
-            if not communication.processing_request:
-                communication.processing_request = True
-                result = await asyncio.get_running_loop().run_in_executor(
-                    None,
-                    process_user_text_with_llm,
-                    db,
-                    communication,
-                    data.get("text"),
-                    t2s_client,
-                    llm_url,
-                    _send_message,
-                )
-                communication.processing_request = False
+            if communication.processing_lock.locked():
+                send_to_cp_type = SendGenericMessage.ERROR
+                send_to_cp = {"message": "Request already in progress!"}
+            else:
+                async with communication.processing_lock:
+                    result = await process_user_text_with_llm(
+                        communication,
+                        data.get("text"),
+                        t2s_client,
+                        llm_url,
+                        stream_to_bot,
+                    )
 
                 if result and bot_client:
                     send_to_bot_type = SendBotMessage.AUDIO_RESPONSE
-                    send_to_bot = {
-                        "response": result.get("audio"),
-                        "content": result.get("text"),
-                        "user_query": result.get("user_query"),
-                        "fixed_prompt": result.get("fixed_prompt"),
-                    }
-            else:
-                send_to_cp_type = SendGenericMessage.ERROR
-                send_to_cp = {"message": "Request already in progress!"}
+                    send_to_bot = _audio_response(result)
+
+        case RecvTag.SEND_AUDIO_CHUNK:
+            # Control panel is streaming audio, transcribe it while it arrives.
+            # Not sent by the controlpanel frontend yet, only by server-side clients.
+            return await _queue_audio_chunk(
+                db,
+                communication,
+                controlpanel,
+                base64.b64decode(data.get("audio")),
+                s2t_client,
+                t2s_client,
+                llm_url,
+            )
+
+        case RecvTag.SEND_AUDIO_END:
+            _end_audio_stream(communication)
+
+        case _:
+            return await _send_invalid_message_type(controlpanel)
 
     if bot_client and send_to_bot and send_to_bot_type:
         await _send_message(bot_client, send_to_bot_type, send_to_bot)
@@ -316,24 +433,169 @@ async def _handle_controlpanel_messages(
         await _send_message(controlpanel, send_to_cp_type, send_to_cp)
 
 
+async def _send_invalid_message_type(socket: WebSocket):
+    await _send_message(
+        socket,
+        SendGenericMessage.ERROR,
+        {"message": "Invalid Message Type"},
+    )
+
+
+def _bot_streamer(
+    communication: LiveCommunication,
+) -> Callable[[str, Dict[str, Any]], Awaitable]:
+    # lets the pipeline stream partial responses to the bot
+    async def stream_to_bot(msg_type: str, msg_data: Dict[str, Any]):
+        if communication.bot_client:
+            await _send_message(communication.bot_client, msg_type, msg_data)
+
+    return stream_to_bot
+
+
+async def _queue_audio_chunk(
+    db: database.Database,
+    communication: LiveCommunication,
+    controlpanel: WebSocket,
+    chunk: bytes,
+    s2t_client: speech_v1.SpeechClient,
+    t2s_client: texttospeech.TextToSpeechClient,
+    llm_url: str,
+):
+    if communication.audio_queue is None:
+        if communication.processing_lock.locked():
+            return await _send_message(
+                controlpanel,
+                SendGenericMessage.ERROR,
+                {"message": "Request already in progress!"},
+            )
+
+        # released by _stream_audio_to_llm once the utterance is processed
+        await communication.processing_lock.acquire()
+        communication.audio_queue = asyncio.Queue()
+        communication.audio_task = asyncio.create_task(
+            _stream_audio_to_llm(
+                db,
+                communication,
+                communication.audio_queue,
+                s2t_client,
+                t2s_client,
+                llm_url,
+                _bot_streamer(communication),
+            )
+        )
+    communication.audio_queue.put_nowait(chunk)
+
+
+async def _stream_audio_to_llm(
+    db: database.Database,
+    communication: LiveCommunication,
+    audio_queue: asyncio.Queue,
+    s2t_client: speech_v1.SpeechClient,
+    t2s_client: texttospeech.TextToSpeechClient,
+    llm_url: str,
+    send_message: Callable[..., Awaitable],
+):
+    loop = asyncio.get_running_loop()
+
+    # chunks sent after the transcript is known are refused while the lock is held
+    def detach_queue():
+        if communication.audio_queue is audio_queue:
+            communication.audio_queue = None
+
+    # blocking iterator over the queued chunks, consumed by the speech client thread
+    def audio_chunks() -> Iterator[bytes]:
+        while True:
+            future = asyncio.run_coroutine_threadsafe(audio_queue.get(), loop)
+            try:
+                chunk = future.result(timeout=AUDIO_CHUNK_TIMEOUT)
+            except concurrent.futures.TimeoutError:
+                future.cancel()
+                logger.warning("No audio received, ending the utterance.")
+                return
+            if chunk is None:
+                return
+            yield chunk
+
+    try:
+        result = await process_user_audio_stream_with_llm(
+            communication,
+            audio_chunks(),
+            s2t_client,
+            t2s_client,
+            llm_url,
+            send_message,
+            detach_queue,
+        )
+    except Exception as e:
+        logger.exception(e)
+        return
+    finally:
+        # later chunks start a new utterance instead of filling this queue
+        detach_queue()
+        communication.audio_task = None
+        communication.processing_lock.release()
+        # the clients may have left while the utterance was processed
+        if communication.flush_task is None:
+            await _flush_pending_writes(db, communication)
+            _park_communication(communication)
+
+    if result and communication.bot_client:
+        await _send_message(
+            communication.bot_client,
+            SendBotMessage.AUDIO_RESPONSE,
+            _audio_response(result),
+        )
+
+
+def _end_audio_stream(communication: LiveCommunication):
+    if communication.audio_queue is not None:
+        communication.audio_queue.put_nowait(None)
+        communication.audio_queue = None
+
+
+def _audio_response(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "response": result.get("audio"),
+        "content": result.get("text"),
+        "user_query": result.get("user_query"),
+        "fixed_prompt": result.get("fixed_prompt"),
+    }
+
+
+def _orjson_default(obj: Any):
+    if isinstance(obj, pyd.BaseModel):
+        return obj.model_dump()
+    raise TypeError
+
+
+def _encode_message(
+    msg_type: str,
+    data: Dict[str, Any],
+) -> str:
+    # same shape as WebSocketResponse, serialized with orjson
+    return orjson.dumps(
+        {"type": msg_type, "data": data}, default=_orjson_default
+    ).decode()
+
+
 async def _send_message(
     socket: WebSocket,
-    msg_type: Union[SendGenericMessage, SendBotMessage, SendControlPanelMessage],
+    msg_type: str,
     data: Dict[str, Any],
 ):
     try:
-        await socket.send_json(WebSocketResponse(type=msg_type, data=data).model_dump())
+        await socket.send_text(_encode_message(msg_type, data))
     except Exception:
         await _close_websocket(socket, SendGenericMessage.CLOSE_CONNECTION, f"Failed to send: {data}")
 
 
 async def _close_websocket(
     socket: WebSocket,
-    res_type: Union[SendGenericMessage, SendBotMessage, SendControlPanelMessage],
+    res_type: str,
     message: str,
 ):
     try:
-        await socket.send_json(WebSocketResponse(type=res_type, data={"message": message}).model_dump())
+        await socket.send_text(_encode_message(res_type, {"message": message}))
         await socket.close()
     except Exception as e:
         logger.debug(e)
@@ -1,21 +1,77 @@
 import base64
+from typing import Iterable
 
 from google.cloud import speech_v1, texttospeech
+from google.cloud.speech_v1.services.speech.transports import SpeechGrpcTransport
+from google.cloud.texttospeech_v1.services.text_to_speech.transports import (
+    TextToSpeechGrpcTransport,
+)
+from loguru import logger
 
 from ..config import get_cfg
 from ..utils import Depends
 
+# text to speech accepts at most 5000 bytes of input
+MAX_TTS_INPUT_BYTES = 4900
 
-def get_s2t_client(cfg=Depends(get_cfg)):
-    # if cfg.debug:
-    #     return speech.SpeechClient()
-    return speech_v1.SpeechClient()
+
+# keep the channels alive between requests instead of reconnecting
+_GRPC_CHANNEL_OPTIONS = [
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.http2.max_pings_without_data", 0),
+]
+
+_s2t_client: speech_v1.SpeechClient = None
+_t2s_client: texttospeech.TextToSpeechClient = None
 
 
-def get_t2s_client(cfg=Depends(get_cfg)):
+def get_s2t_client(cfg=Depends(get_cfg)) -> speech_v1.SpeechClient:
+    """
+    Shared speech to text client, created on first use. Every dependant
+    reuses the same gRPC channel.
+    """
+    global _s2t_client
     # if cfg.debug:
     #     return speech.SpeechClient()
-    return texttospeech.TextToSpeechClient()
+    if _s2t_client is None:
+        channel = SpeechGrpcTransport.create_channel(
+            "speech.googleapis.com:443",
+            options=_GRPC_CHANNEL_OPTIONS,
+        )
+        _s2t_client = speech_v1.SpeechClient(
+            transport=SpeechGrpcTransport(channel=channel)
+        )
+    return _s2t_client
+
+
+def get_t2s_client(cfg=Depends(get_cfg)) -> texttospeech.TextToSpeechClient:
+    """
+    Shared text to speech client, created on first use. Every dependant
+    reuses the same gRPC channel.
+    """
+    global _t2s_client
+    # if cfg.debug:
+    #     return speech.SpeechClient()
+    if _t2s_client is None:
+        channel = TextToSpeechGrpcTransport.create_channel(
+            "texttospeech.googleapis.com:443",
+            options=_GRPC_CHANNEL_OPTIONS,
+        )
+        _t2s_client = texttospeech.TextToSpeechClient(
+            transport=TextToSpeechGrpcTransport(channel=channel)
+        )
+    return _t2s_client
+
+
+def _recognition_config() -> speech_v1.RecognitionConfig:
+    return speech_v1.RecognitionConfig(
+        encoding=speech_v1.RecognitionConfig.AudioEncoding.MP3,  # Change based on audio type
+        sample_rate_hertz=16000,
+        language_code="en-IN",
+    )
 
 
 def transcribe_audio(
@@ -23,13 +79,8 @@ def transcribe_audio(
     client: speech_v1.SpeechClient,
 ) -> str:
     audio = speech_v1.RecognitionAudio(content=audio_bytes)
-    config = speech_v1.RecognitionConfig(
-        encoding=speech_v1.RecognitionConfig.AudioEncoding.MP3,  # Change based on audio type
-        sample_rate_hertz=16000,
-        language_code="en-IN",
-    )
     request = speech_v1.RecognizeRequest(
-        config=config,
+        config=_recognition_config(),
         audio=audio,
     )
 
@@ -42,6 +93,52 @@ def transcribe_audio(
     return transcript
 
 
+def streaming_transcribe(
+    audio_chunks: Iterable[bytes],
+    client: speech_v1.SpeechClient,
+) -> str:
+    """
+    Transcribe a single utterance while its audio is still being received.
+    Returns as soon as the first final result arrives.
+    """
+    config = speech_v1.StreamingRecognitionConfig(
+        config=_recognition_config(),
+        single_utterance=True,
+        interim_results=False,
+    )
+    requests = (
+        speech_v1.StreamingRecognizeRequest(audio_content=chunk)
+        for chunk in audio_chunks
+    )
+
+    responses = client.streaming_recognize(config=config, requests=requests)
+
+    transcript = ""
+    for response in responses:
+        for result in response.results:
+            if result.is_final:
+                transcript += result.alternatives[0].transcript
+        if transcript:
+            # no need to wait for the rest of the audio
+            responses.cancel()
+            break
+
+    return transcript
+
+
+def truncate_for_tts(text: str, limit: int = MAX_TTS_INPUT_BYTES) -> str:
+    # a character is at most 4 bytes in utf-8, so short text never needs encoding
+    if len(text) <= limit // 4:
+        return text
+
+    encoded = text.encode("utf-8")
+    if len(encoded) <= limit:
+        return text
+
+    logger.warning(f"🔇 TTS input exceeded {limit} bytes, truncating for safety.")
+    return encoded[:limit].decode("utf-8", errors="ignore")
+
+
 def text_to_speech(
     text: str,
     client: texttospeech.TextToSpeechClient,
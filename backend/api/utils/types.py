@@ -1,47 +1,85 @@
-from enum import Enum
+import sys
+from enum import EnumMeta, StrEnum
 
 
-# COMMUNICATION
-class SendGenericMessage(Enum):
-    CONNECTION_SUCCESSFUL = "CONNECTION_SUCCESSFUL"
-    CLOSE_CONNECTION = "CLOSE_CONNECTION"
-    INVALID_COMMUNICATION_ID = "INVALID_COMMUNICATION_ID"
-    ERROR = "ERROR"
-    SYSTEM_CONFIG = "SYSTEM_CONFIG"
+class FastStrEnumMeta(EnumMeta):
+    """Looks up members of str enums by value with a single dict access"""
+
+    def __init__(cls, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        cls._v2m = {member.value: member for member in cls}
+        cls._values = tuple(member.value for member in cls)
+        cls._names = tuple(member.name for member in cls)
+        cls._choices = tuple((member.value, member.name) for member in cls)
 
+    def __call__(cls, value, *args, **kwargs):
+        if not args and not kwargs and isinstance(value, str):
+            member = cls._v2m.get(value)
+            if member is not None:
+                return member
+        return super().__call__(value, *args, **kwargs)
 
-class SendBotMessage(Enum):
-    NEW_BOT_DETECTED = "NEW_BOT_DETECTED"
-    AUDIO_RESPONSE = "AUDIO_RESPONSE"
+    def from_value(cls, value):
+        """Returns the member with the given value, or None"""
+        return cls._v2m.get(value)
 
+    def values(cls):
+        return cls._values
 
-class ReceiveBotMessage(Enum):
-    SEND_AUDIO = "SEND_AUDIO"
-    SEND_TEXT = "SEND_TEXT"
+    def names(cls):
+        return cls._names
 
+    def choices(cls):
+        return cls._choices
 
-class SendControlPanelMessage(Enum):
-    NEW_CONTROL_PANEL_DETECTED = "NEW_CONTROL_PANEL_DETECTED"
-    IS_BOT_CONNECTED = "IS_BOT_CONNECTED"
-    PING_STATE = "PING_STATE"
+
+# COMMUNICATION
+# message types are only used as tags, so they are plain interned strings
+class SendGenericMessage:
+    CONNECTION_SUCCESSFUL = sys.intern("CONNECTION_SUCCESSFUL")
+    CLOSE_CONNECTION = sys.intern("CLOSE_CONNECTION")
+    INVALID_COMMUNICATION_ID = sys.intern("INVALID_COMMUNICATION_ID")
+    ERROR = sys.intern("ERROR")
+    SYSTEM_CONFIG = sys.intern("SYSTEM_CONFIG")
+
+
+class SendBotMessage:
+    NEW_BOT_DETECTED = sys.intern("NEW_BOT_DETECTED")
+    AUDIO_RESPONSE = sys.intern("AUDIO_RESPONSE")
+    # streamed parts of an llm response, followed by a final AUDIO_RESPONSE
+    TEXT_CHUNK = sys.intern("TEXT_CHUNK")
+    AUDIO_CHUNK = sys.intern("AUDIO_CHUNK")
+
+
+class SendControlPanelMessage:
+    NEW_CONTROL_PANEL_DETECTED = sys.intern("NEW_CONTROL_PANEL_DETECTED")
+    IS_BOT_CONNECTED = sys.intern("IS_BOT_CONNECTED")
+    PING_STATE = sys.intern("PING_STATE")
     # forwarded user input from bot or controlpanel
-    USER_INPUT = "USER_INPUT"
+    USER_INPUT = sys.intern("USER_INPUT")
 
 
-class ReceiveControlPanelMessage(Enum):
-    UPDATE_CONFIG = "UPDATE_CONFIG"
-    PING = "PING"
-    SEND_AUDIO = "SEND_AUDIO"
-    SEND_TEXT = "SEND_TEXT"
+# received from both clients, the channel is known from the connection
+class RecvTag:
+    # bot and controlpanel
+    SEND_AUDIO = sys.intern("SEND_AUDIO")
+    SEND_TEXT = sys.intern("SEND_TEXT")
+    # controlpanel only
+    UPDATE_CONFIG = sys.intern("UPDATE_CONFIG")
+    PING = sys.intern("PING")
+    # audio streamed in small chunks, transcribed while it is received.
+    # Server-side clients only, the controlpanel frontend does not send these yet.
+    SEND_AUDIO_CHUNK = sys.intern("SEND_AUDIO_CHUNK")
+    SEND_AUDIO_END = sys.intern("SEND_AUDIO_END")
 
 
-class SkinType(str, Enum):
+class SkinType(StrEnum, metaclass=FastStrEnumMeta):
     FULLBOT = "fullbot"
     SIMPLE = "simple"
     FACEONLY = "faceonly"
 
 
-class LLMModel(str, Enum):
+class LLMModel(StrEnum, metaclass=FastStrEnumMeta):
     gemma2_9b = "gemma2:9b"
     llama3 = "llama3"
     nemotron_mini_latest = "nemotron-mini:latest"
@@ -50,19 +88,19 @@ class LLMModel(str, Enum):
 
 
 # CHAT
-class MessageType(str, Enum):
+class MessageType(StrEnum, metaclass=FastStrEnumMeta):
     ASSISTANT = "assistant"
     USER = "user"
 
 
-class VoiceLanguageCode(str, Enum):
+class VoiceLanguageCode(StrEnum, metaclass=FastStrEnumMeta):
     en_AU = "en-AU"
     en_GB = "en-GB"
     en_IN = "en-IN"
     en_US = "en-US"
 
 
-class VoiceGender(str, Enum):
+class VoiceGender(StrEnum, metaclass=FastStrEnumMeta):
     MALE = "MALE"
     FEMALE = "FEMALE"
     NEUTRAL = "NEUTRAL"
@@ -70,7 +108,7 @@ class VoiceGender(str, Enum):
 
 
 # USER DATA
-class Activity(str, Enum):
+class Activity(StrEnum, metaclass=FastStrEnumMeta):
     RUNNING = "Running"
     CYCLING = "Cycling"
     YOGA = "Yoga"
@@ -80,7 +118,7 @@ class Activity(str, Enum):
     HIKING = "Hiking"
 
 
-class DayOfWeek(str, Enum):
+class DayOfWeek(StrEnum, metaclass=FastStrEnumMeta):
     MONDAY = "Monday"
     TUESDAY = "Tuesday"
     WEDNESDAY = "Wednesday"
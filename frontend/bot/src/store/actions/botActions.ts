@@ -10,6 +10,8 @@ import {
   setWaitingForResponseState,
   SystemConfig,
   setAssistantMessage,
+  appendAssistantMessage,
+  endAssistantMessageStream,
 } from "store/slices/botSlice";
 import { doNothing, SnackbarType } from "store/slices/globalSlice";
 import { messageToJson, socketReceiveMsgTypes, socketSendMsgTypes } from "utils";
@@ -85,6 +87,9 @@ const handleSocketOnMessage = (event: MessageEvent) => (dispatch: AppDispatch) =
       break;
 
     case socketReceiveMsgTypes.ERROR:
+      // a failed request ends any response that was still streaming
+      dispatch(setWaitingForResponseState(false));
+      dispatch(endAssistantMessageStream());
       if (data.message) {
         dispatch(
           showSnackbar({
@@ -103,6 +108,14 @@ const handleSocketOnMessage = (event: MessageEvent) => (dispatch: AppDispatch) =
       dispatch(handleAudioResponse(data));
       break;
 
+    case socketReceiveMsgTypes.TEXT_CHUNK:
+      dispatch(handleTextChunk(data));
+      break;
+
+    case socketReceiveMsgTypes.AUDIO_CHUNK:
+      dispatch(handleAudioChunk(data));
+      break;
+
     default:
       dispatch(doNothing());
       break;
@@ -245,6 +258,31 @@ const handleAudioResponse = (data: any) => (dispatch: AppDispatch) => {
     dispatch(doNothing());
     return;
   }
+  dispatch(addAudioToQueue(audioUrlFromBase64(audioBase64)));
+};
+
+// partial text of a response that is still being generated
+const handleTextChunk = (data: any) => (dispatch: AppDispatch) => {
+  const { content } = data;
+  if (typeof content !== "string" || !content) {
+    dispatch(doNothing());
+    return;
+  }
+  dispatch(setWaitingForResponseState(false));
+  dispatch(appendAssistantMessage(content));
+};
+
+// audio for a single sentence of a response that is still being generated
+const handleAudioChunk = (data: any) => (dispatch: AppDispatch) => {
+  const { response: audioBase64 } = data;
+  if (!audioBase64?.trim()) {
+    dispatch(doNothing());
+    return;
+  }
+  dispatch(addAudioToQueue(audioUrlFromBase64(audioBase64)));
+};
+
+const audioUrlFromBase64 = (audioBase64: string): string => {
   const binaryString = atob(audioBase64);
   const binaryLen = binaryString.length;
   const bytes = new Uint8Array(binaryLen);
@@ -255,9 +293,8 @@ const handleAudioResponse = (data: any) => (dispatch: AppDispatch) => {
   // Create a Blob from the binary data
   const audioBlob = new Blob([bytes], { type: "audio/mpeg" });
 
-  // Create a URL for the Blob and play the audio
-  const audioUrl = URL.createObjectURL(audioBlob);
-  dispatch(addAudioToQueue(audioUrl));
+  // Create a URL for the Blob to play the audio
+  return URL.createObjectURL(audioBlob);
 };
 let isRecognitionRunning = false;
 export const startSpeechRecognition = () => (dispatch: AppDispatch) => {
@@ -22,6 +22,8 @@ interface BotState {
   waitingForResponse: boolean;
   audioQueue: string[];
   assistantMessage?: string;
+  // whether assistantMessage is being built from streamed chunks
+  streamingAssistantMessage: boolean;
   shouldStopAudio: boolean;
   isPlaying: boolean;
 }
@@ -41,6 +43,7 @@ const initialState: BotState = {
   waitingForResponse: false,
   audioQueue: [],
   assistantMessage: "",
+  streamingAssistantMessage: false,
   shouldStopAudio: false,
   isPlaying: false,
 };
@@ -72,10 +75,22 @@ const botSlice = createSlice({
     },
     setAssistantMessage: (state, action: PayloadAction<string>) => {
       state.assistantMessage = action.payload;
+      state.streamingAssistantMessage = false;
+    },
+    appendAssistantMessage: (state, action: PayloadAction<string>) => {
+      // the first chunk of a response replaces the previous message
+      state.assistantMessage = state.streamingAssistantMessage
+        ? `${state.assistantMessage ?? ""}${action.payload}`
+        : action.payload;
+      state.streamingAssistantMessage = true;
+    },
+    endAssistantMessageStream: (state) => {
+      state.streamingAssistantMessage = false;
     },
     clearAllAudioAndReset: (state) => {
       state.audioQueue = [];
       state.assistantMessage = "";
+      state.streamingAssistantMessage = false;
       state.waitingForResponse = false;
       state.shouldStopAudio = true;
       state.isPlaying = false;
@@ -98,6 +113,8 @@ export const {
   addAudioToQueue,
   removeFirstFromAudioQueue,
   setAssistantMessage,
+  appendAssistantMessage,
+  endAssistantMessageStream,
   clearAllAudioAndReset,
   resetStopAudioFlag,
   setIsPlaying,
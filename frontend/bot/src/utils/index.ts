@@ -13,6 +13,8 @@ export const socketReceiveMsgTypes = {
   ERROR: "ERROR",
   SYSTEM_CONFIG: "SYSTEM_CONFIG",
   AUDIO_RESPONSE: "AUDIO_RESPONSE",
+  TEXT_CHUNK: "TEXT_CHUNK",
+  AUDIO_CHUNK: "AUDIO_CHUNK",
   SUBTITLES_TOGGLE: "SUBTITLES_TOGGLE",
 };
 